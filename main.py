@@ -21,29 +21,31 @@ def main():
 
     # Download data
     downloader = DataDownloader(url)
-    downloader.run()  # Download, unzip, clean, and save as pickle
+    downloader.run()  # Download, clean, and save as Parquet
 
     # Download GeoJSON files
-    downloader.load_geojson('regions', regions_geojson_url)
-    downloader.load_geojson('departments', departments_geojson_url)
-    downloader.load_geojson('communes', communes_geojson_url)
+    downloader.load_geojsons({
+        'regions': regions_geojson_url,
+        'departments': departments_geojson_url,
+        'communes': communes_geojson_url,
+    })
 
     # Preprocess data
     preprocess_main()
 
     # Generate maps
     make_map(
-        os.path.join(base_path, 'cleaned', 'prix_m2_par_departement.pkl'),
+        os.path.join(base_path, 'cleaned', 'prix_m2_par_departement.feather'),
         os.path.join(base_path, 'cleaned', 'departments.geojson'),
         "region"
     )
     make_map(
-        os.path.join(base_path, 'cleaned', 'prix_m2_par_commune.pkl'),
+        os.path.join(base_path, 'cleaned', 'prix_m2_par_commune.feather'),
         os.path.join(base_path, 'cleaned', 'communes.geojson'),
         "departement"
     )
     make_map(
-        os.path.join(base_path, 'cleaned', 'prix_m2_par_region.pkl'),
+        os.path.join(base_path, 'cleaned', 'prix_m2_par_region.feather'),
         os.path.join(base_path, 'cleaned', 'regions.geojson'),
         "pays"
     )
@@ -53,7 +55,7 @@ def main():
 
 if __name__ == "__main__":
 
-    if not os.path.exists(os.path.join(base_path, 'cleaned', 'full_with_region.pkl')):
+    if not os.path.exists(os.path.join(base_path, 'cleaned', 'full_with_region.parquet')):
         logging.info("Data not found. Running data preparation...")
         main()
         from src.app import create_app
@@ -4,8 +4,8 @@ from config import DATA_DIR
 import os
 
 # Load the preprocessed data
-DATA_FILE = os.path.join(DATA_DIR, 'full_with_region.pkl')
-data = pd.read_pickle(DATA_FILE)
+DATA_FILE = os.path.join(DATA_DIR, 'full_with_region.parquet')
+data = pd.read_parquet(DATA_FILE, columns=['code_commune', 'code_departement', 'region', 'price_per_m2'])
 
 # Layout for the histogram
 def HistogrammeComponent():
@@ -1,12 +1,18 @@
 import pandas as pd
-from dash import dcc, html, Input, Output, callback
+from dash import dcc, html, Input, Output, Patch, callback
 from config import DATA_DIR, load_region_dept_commune_map
 import os
 
-DATA_FILE = os.path.join(DATA_DIR, 'full.pkl')
-data = pd.read_pickle(DATA_FILE)
+DATA_FILE = os.path.join(DATA_DIR, 'full.parquet')
+data = pd.read_parquet(DATA_FILE, columns=['code_commune', 'code_departement', 'type_local'])
 map = load_region_dept_commune_map()
 
+# Department codes of each region, built once instead of on every callback
+REGION_DEPT_CODES = {
+    region: tuple(dept_info['code'] for dept_info in info['departments'].values())
+    for region, info in map.items()
+}
+
 # Layout for the pie chart
 def PieComponent():
     return html.Div(
@@ -14,6 +20,26 @@ def PieComponent():
             html.H2('Pie Chart of Type Local'),
             dcc.Graph(
                 id='type-local-pie-chart',
+                # Seed an empty pie so the callback can patch labels/values/title in place
+                figure={
+                    'data': [
+                        {
+                            'labels': [],
+                            'values': [],
+                            'type': 'pie',
+                            'name': 'Type Local Distribution',
+                        }
+                    ],
+                    'layout': {
+                        'title': {
+                            'text': '',
+                            'font': {'size': 14},  # Font size for the title
+                            'x': 0.5,  # Center align the title
+                        },
+                        'height': 400,
+                        'margin': {'l': 10, 'r': 10, 't': 50, 'b': 10},
+                    }
+                },
                 config={'displayModeBar': False},  # Hides the mode bar for a cleaner look
                 style={'height': '400px', 'width': '100%'},  # Adjust height and width
             ),
@@ -21,16 +47,21 @@ def PieComponent():
         className='pie-chart-container',  # Add a class for styling
     )
 
+def _patch_pie(labels, values, title):
+    # Only send the fields that change instead of the whole figure
+    patched_figure = Patch()
+    patched_figure['data'][0]['labels'] = labels
+    patched_figure['data'][0]['values'] = values
+    patched_figure['layout']['title']['text'] = title
+    return patched_figure
+
 @callback(
     Output('type-local-pie-chart', 'figure'),
     Input('selected-location', 'data'),
 )
 def update_pie_chart(selected_location):
     if not selected_location:
-        return {
-            'data': [],
-            'layout': {'title': 'No data available. Please select a location.'}
-        }
+        return _patch_pie([], [], 'No data available. Please select a location.')
 
     # Retrieve numeric codes for filtering
     region = selected_location.get('region')
@@ -52,39 +83,16 @@ def update_pie_chart(selected_location):
         ]
         title = f'Type Local Distribution for Department {department}'
     else:
-        departments = map[region]['departments']
-        department_codes = [dept_info['code'] for dept_info in departments.values()]
+        department_codes = REGION_DEPT_CODES[region]
         filtered_data = data[
             (data['code_departement'].isin(department_codes))
         ]
         title = f'Type Local Distribution for Region {region}'
 
     if filtered_data.empty:
-        return {
-            'data': [],
-            'layout': {'title': f'No data available for Commune {commune_code}'}
-        }
+        return _patch_pie([], [], f'No data available for Commune {commune_code}')
 
     # Create pie chart for 'type_local'
     pie_data = filtered_data['type_local'].value_counts()
 
-    figure = {
-        'data': [
-            {
-                'labels': pie_data.index,
-                'values': pie_data.values,
-                'type': 'pie',
-                'name': 'Type Local Distribution',
-            }
-        ],
-        'layout': {
-            'title': {
-                'text': title,
-                'font': {'size': 14},  # Font size for the title
-                'x': 0.5,  # Center align the title
-            },
-            'height': 400,
-            'margin': {'l': 10, 'r': 10, 't': 50, 'b': 10},
-        }
-    }
-    return figure
\ No newline at end of file
+    return _patch_pie(pie_data.index.tolist(), pie_data.values.tolist(), title)
@@ -5,16 +5,32 @@ data, showing the average price per square meter at various geographic levels.
 
 import os
 import logging
-import json
+import hashlib
+import pickle
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
 import folium
+from branca.colormap import StepColormap
+from branca.utilities import color_brewer
 
 from config import load_region_dept_commune_map
+from src.utils.json_io import load_json
+from src.utils.preprocess_data import extract_department_codes
 
 base_path = os.path.abspath('data')
 
 
+def _render_one(task):
+    """
+    Render a single choropleth map from a tuple of render_choropleth_map arguments.
+    Kept at module level so it can be sent to worker processes.
+    """
+    ChoroplethMapGenerator.render_choropleth_map(*task)
+
+
 class ChoroplethMapGenerator:
     """
     A class for generating choropleth maps based on geographic and real estate data.
@@ -30,13 +46,19 @@ class ChoroplethMapGenerator:
         "region": 7,  # Suitable zoom level for a region
         "departement": 9  # Suitable zoom level for a department
     }
+    SIMPLIFY_PRECISION_MAP = {
+        "pays": 2,  # Decimals kept on coordinates, about 1 km at country zoom
+        "region": 3,  # About 100 m
+        "departement": 3  # About 100 m
+    }
+    GEOJSON_CACHE_VERSION = 2  # Bump when the content of the GeoJSON cache changes
 
     def __init__(self, pickle_file, geojson_file, level):
         """
          Initialize the ChoroplethMapGenerator with data and configurations.
 
          Args:
-             pickle_file (str): Path to the pickle file containing grouped data.
+             pickle_file (str): Path to the Feather or pickle file containing grouped data.
              geojson_file (str): Path to the GeoJSON file for geographic data.
              level (str): Geographic level for the map (e.g., "region", "departement").
          """
@@ -46,25 +68,40 @@ class ChoroplethMapGenerator:
         self.scale_list = self.scale_dept_commune_map.keys()
         self.output_dir = os.path.join(base_path, f'cleaned/{level}s_maps/')
         self.level = level
+        self._feat_by_code = {}
+        self._moments_by_code = {}
+        self._indexed_geojson = None
         os.makedirs(self.output_dir, exist_ok=True)
 
     @staticmethod
     def load_grouped_data(pickle_filename):
         """
-        Load the preprocessed DataFrame from a pickle file.
+        Load the preprocessed DataFrame from a Feather or pickle file, storing the
+        geographic code columns as categoricals for cheaper filtering and grouping.
+        The log price used by the map colors is added when the file lacks it.
 
         Args:
-            pickle_filename (str): Path to the pickle file.
+            pickle_filename (str): Path to the Feather or pickle file.
 
         Returns:
             pd.DataFrame: The loaded DataFrame.
         """
-        return pd.read_pickle(pickle_filename)
+        if pickle_filename.endswith('.feather'):
+            df = pd.read_feather(pickle_filename, use_threads=True)
+        else:
+            df = pd.read_pickle(pickle_filename)
+        for column in ('region', 'departement', 'commune'):
+            if column in df.columns:
+                df[column] = df[column].astype('category')
+        if 'log_price_per_m2' not in df.columns:
+            # Grouped files written before the log price was stored by group_by_level
+            df['log_price_per_m2'] = np.log1p(df['average_price_per_m2'].astype('float64'))
+        return df
 
     @staticmethod
     def add_price_to_geojson(df, geojson_data, geojson_key):
         """
-        Add the average price per square meter from the DataFrame to the GeoJSON data.
+        Add the average price per square meter and its log from the DataFrame to the GeoJSON data.
 
         Args:
             df (pd.DataFrame): DataFrame containing price data.
@@ -76,20 +113,27 @@ class ChoroplethMapGenerator:
         """
 
         # Convert the DataFrame to a dictionary for easy lookup
-        df_dict = df.set_index(geojson_key)['average_price_per_m2'].to_dict()
+        # (tolist yields plain Python floats, which the float32 column would not give JSON-ready)
+        df_dict = dict(zip(
+            df[geojson_key].tolist(),
+            zip(df['average_price_per_m2'].tolist(), df['log_price_per_m2'].tolist())
+        ))
 
         # Loop through each feature in the GeoJSON file and add the price per m²
+        get_prices = df_dict.get
         for feature in geojson_data['features']:
-            code = feature['properties'][geojson_key]
-            # Add the price to the feature's properties if the department exists in the DataFrame
-            feature['properties']['average_price_per_m2'] = df_dict.get(code, None)
+            properties = feature['properties']
+            # Add the prices to the feature's properties if the department exists in the DataFrame
+            properties['average_price_per_m2'], properties['log_price_per_m2'] = get_prices(
+                properties[geojson_key], (None, None)
+            )
 
         return geojson_data
 
     @staticmethod
     def calculate_geojson_center(geojson_data):
         """
-        Calculate the geographic center (centroid) of the given GeoJSON features.
+        Calculate the geographic center (area-weighted centroid) of the given GeoJSON features.
 
         Parameters:
         - geojson_data (dict): A GeoJSON FeatureCollection.
@@ -97,44 +141,198 @@ class ChoroplethMapGenerator:
         Returns:
         - tuple: (latitude, longitude) of the centroid.
         """
-        latitudes, longitudes = [], []
-        for feature in geojson_data['features']:
-            geom = feature['geometry']
-            coords = geom['coordinates']
+        moments = sum(
+            (ChoroplethMapGenerator._geometry_moments(feature['geometry'])
+             for feature in geojson_data['features']),
+            np.zeros(3)
+        )
+        return ChoroplethMapGenerator._center_from_moments(moments)
 
-            if geom['type'] == 'Polygon':
-                latitudes, longitudes = ChoroplethMapGenerator._extract_polygon_coords(coords, latitudes, longitudes)
-            elif geom['type'] == 'MultiPolygon':
-                latitudes, longitudes = ChoroplethMapGenerator._extract_multipolygon_coords(coords, latitudes,
-                                                                                            longitudes)
-
-        if latitudes and longitudes:
-            return np.mean(latitudes), np.mean(longitudes)
+    @staticmethod
+    def _center_from_moments(moments):
+        """
+        Turn summed (area, area * lon, area * lat) moments into a (latitude, longitude) center.
+        """
+        area, moment_lon, moment_lat = moments
+        if area > 0:
+            return moment_lat / area, moment_lon / area
         else:
             return 46.603354, 1.888334  # Default to the center of France
 
     @staticmethod
-    def _extract_polygon_coords(coords, latitudes, longitudes):
+    def _geometry_moments(geom):
+        """
+        Compute the area of a Polygon or MultiPolygon geometry and its first moments with the
+        shoelace formula, as an array (area, area * centroid lon, area * centroid lat).
+        Exterior rings count positively and holes negatively, whatever their winding order.
+        """
+        moments = np.zeros(3)
+        for ring_index, ring in ChoroplethMapGenerator._iter_rings(geom):
+            # Work relative to the first vertex to limit cancellation errors
+            origin_lon, origin_lat = ring[0]
+            x, y = ring[:, 0] - origin_lon, ring[:, 1] - origin_lat
+            cross = x[:-1] * y[1:] - x[1:] * y[:-1]
+            area = cross.sum() / 2
+            ring_moments = np.array([
+                area,
+                ((x[:-1] + x[1:]) * cross).sum() / 6 + area * origin_lon,
+                ((y[:-1] + y[1:]) * cross).sum() / 6 + area * origin_lat,
+            ])
+            sign = 1 if ring_moments[0] >= 0 else -1
+            moments += (-sign if ring_index else sign) * ring_moments
+        return moments
+
+    @staticmethod
+    def _iter_rings(geom):
+        """
+        Yield each ring of a Polygon or MultiPolygon geometry with its index in its polygon
+        (0 for the exterior ring) and its coordinates as an (n, 2) array of lon/lat.
         """
-        Extract coordinates from a Polygon geometry.
+        if geom['type'] == 'Polygon':
+            polygons = [geom['coordinates']]
+        elif geom['type'] == 'MultiPolygon':
+            polygons = geom['coordinates']
+        else:
+            return
+        for polygon in polygons:
+            for ring_index, ring in enumerate(polygon):
+                if ring:
+                    yield ring_index, np.asarray(ring, dtype=np.float64)[:, :2]
+
+    @classmethod
+    def simplify_geojson(cls, geojson_data, precision):
+        """
+        Simplify the GeoJSON geometries in place by snapping their coordinates to the given
+        number of decimals and dropping the vertices that become duplicates. Neighbouring
+        features share their border vertices, so their borders still line up afterwards.
+
+        Args:
+            geojson_data (dict): GeoJSON data to simplify.
+            precision (int): Number of decimals kept on coordinates.
+
+        Returns:
+            dict: The simplified GeoJSON data.
         """
-        for ring in coords:
-            for lon, lat in ring:
-                latitudes.append(lat)
-                longitudes.append(lon)
-        return latitudes, longitudes
+        for feature in geojson_data['features']:
+            geom = feature['geometry']
+            if geom['type'] == 'Polygon':
+                polygons = cls._simplify_polygons([geom['coordinates']], precision)
+                if polygons:
+                    geom['coordinates'] = polygons[0]
+            elif geom['type'] == 'MultiPolygon':
+                polygons = cls._simplify_polygons(geom['coordinates'], precision)
+                if polygons:
+                    geom['coordinates'] = polygons
+        return geojson_data
 
     @staticmethod
-    def _extract_multipolygon_coords(coords, latitudes, longitudes):
+    def _simplify_polygons(polygons, precision):
+        """
+        Snap the rings of a list of polygons. Rings that collapse below a triangle are dropped,
+        as are polygons whose exterior ring collapses.
+        """
+        simplified = []
+        for polygon in polygons:
+            rings = []
+            for index, ring in enumerate(polygon):
+                if not ring:
+                    coords = np.empty((0, 2))
+                else:
+                    coords = np.round(np.asarray(ring, dtype=np.float64)[:, :2], precision)
+                keep = np.ones(len(coords), dtype=bool)
+                keep[1:] = (coords[1:] != coords[:-1]).any(axis=1)
+                coords = coords[keep]
+                if len(coords) >= 4:
+                    rings.append(coords.tolist())
+                elif index == 0:
+                    break
+            if rings:
+                simplified.append(rings)
+        return simplified
+
+    def _prepare_indices(self, geojson_data, geojson_key):
+        """
+        Index the GeoJSON features and their area moments by code, so that sub-maps
+        can be assembled and centered by lookup instead of rescanning every feature.
+
+        Args:
+            geojson_data (dict): GeoJSON data to index.
+            geojson_key (str): Feature property holding the code.
+        """
+        feat_by_code = self._feat_by_code = {}
+        moments_by_code = self._moments_by_code = {}
+        self._indexed_geojson = geojson_data
+        geometry_moments = self._geometry_moments
+        for feature in geojson_data['features']:
+            code = feature['properties'][geojson_key]
+            feat_by_code[code] = feature
+            moments_by_code[code] = geometry_moments(feature['geometry'])
+
+    def _load_geojson(self, geojson_key):
+        """
+        Load the GeoJSON file, simplify it and index it by code, reusing a pickle cache keyed
+        by the file path, its modification time and the simplification precision when one exists.
+        An unreadable cache file is rebuilt, and older versions of the same file are evicted.
+
+        Args:
+            geojson_key (str): Feature property holding the code.
+
+        Returns:
+            dict: The loaded GeoJSON data.
         """
-        Extract coordinates from a MultiPolygon geometry.
+        precision = self.SIMPLIFY_PRECISION_MAP.get(self.level, 3)
+        entry = (os.path.abspath(self.geojson_file), geojson_key, precision)
+        key = (self.GEOJSON_CACHE_VERSION, entry, os.path.getmtime(self.geojson_file))
+        cache_dir = os.path.join(base_path, 'cache')
+        # Versions of the same entry share a prefix, so that older ones can be evicted
+        prefix = hashlib.md5(repr(entry).encode()).hexdigest() + '-'
+        cache_path = os.path.join(cache_dir, prefix + hashlib.md5(repr(key).encode()).hexdigest() + '.pkl')
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as f:
+                    geojson_data, self._feat_by_code, self._moments_by_code = pickle.load(f)
+            except (EOFError, pickle.UnpicklingError, ValueError) as e:
+                logging.warning("Discarding unreadable GeoJSON cache %s: %s", cache_path, e)
+                os.remove(cache_path)
+            else:
+                self._indexed_geojson = geojson_data
+                logging.info("Loaded cached GeoJSON from %s", cache_path)
+                return geojson_data
+
+        geojson_data = self.simplify_geojson(load_json(self.geojson_file), precision)
+        self._prepare_indices(geojson_data, geojson_key)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first, so an interrupted write never leaves a truncated cache
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=prefix, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((geojson_data, self._feat_by_code, self._moments_by_code), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        # Evict the entries (and leftover temporary files) of older versions of the same file
+        for name in os.listdir(cache_dir):
+            path = os.path.join(cache_dir, name)
+            if name.startswith(prefix) and path != cache_path:
+                os.remove(path)
+        logging.info("Cached GeoJSON to %s", cache_path)
+        return geojson_data
+
+    def _center_of_codes(self, codes):
         """
-        for polygon in coords:
-            for ring in polygon:
-                for lon, lat in ring:
-                    latitudes.append(lat)
-                    longitudes.append(lon)
-        return latitudes, longitudes
+        Compute the area-weighted centroid of the given feature codes from their cached moments.
+
+        Args:
+            codes (iterable): Feature codes to center on.
+
+        Returns:
+            tuple: (latitude, longitude) of the center.
+        """
+        moments_by_code = self._moments_by_code
+        moments = sum((moments_by_code[code] for code in codes if code in moments_by_code), np.zeros(3))
+        return self._center_from_moments(moments)
 
     def display_scale_list(self, scale_name):
         """
@@ -160,7 +358,7 @@ class ChoroplethMapGenerator:
         logging.info("Departments in %s:", scale_name)
         return [dept_info.get('code', 'N/A') for dept_info in min_scale.values()]
 
-    def create_choropleth_map(self, df, geojson_data, geojson_key, level, map_filename=None):
+    def create_choropleth_map(self, df, geojson_data, geojson_key, level, map_filename=None, center=None):
         """
         Create a choropleth map showing the average price per square meter by the specified level,
         using a logarithmic scale to handle wide ranges of values.
@@ -170,55 +368,81 @@ class ChoroplethMapGenerator:
             geojson_key (str): Key to match between the DataFrame and GeoJSON.
             level (str): Geographic level for the map.
             map_filename (str, optional): Output filename for the map. Defaults to None.
+            center (tuple, optional): (latitude, longitude) of the map. Computed from
+                geojson_data when not given.
+        """
+        self.render_choropleth_map(self.level, df, geojson_data, geojson_key, level, map_filename, center)
+
+    @classmethod
+    def render_choropleth_map(cls, scale_level, df, geojson_data, geojson_key, level, map_filename=None,
+                              center=None):
+        """
+        Render and save a choropleth map. Only depends on the generator's level, so it can run
+        in a worker process without pickling the generator itself.
+
+        Args:
+            scale_level (str): Level of the generator (e.g., "pays", "region").
+            df (pd.DataFrame): DataFrame containing price data.
+            geojson_data (dict): GeoJSON data for the map.
+            geojson_key (str): Key to match between the DataFrame and GeoJSON.
+            level (str): Geographic level for the map.
+            map_filename (str, optional): Output filename for the map. Defaults to None.
+            center (tuple, optional): (latitude, longitude) of the map. Computed from
+                geojson_data when not given.
         """
         code = 'code'
-        zoom_start = self.ZOOM_START_MAP.get(level, 8)
-        if self.LEVEL_MAP[self.level] in df.columns:
-            if self.LEVEL_MAP[self.level] == "region":
-                df = df.rename(columns={self.LEVEL_MAP[self.level]: 'nom'})
+        zoom_start = cls.ZOOM_START_MAP.get(level, 8)
+        level_column = cls.LEVEL_MAP[scale_level]
+        if level_column in df.columns:
+            if level_column == "region":
+                df = df.rename(columns={level_column: 'nom'})
                 code = 'nom'
             else:
-                df = df.rename(columns={self.LEVEL_MAP[self.level]: 'code'})
-        df['log_price_per_m2'] = np.log1p(df['average_price_per_m2'])
-        center_lat, center_lon = self.calculate_geojson_center(geojson_data)
-        geojson_data = self.add_price_to_geojson(df, geojson_data, geojson_key)
-        thresholds = [
-            df['log_price_per_m2'].min(), df['log_price_per_m2'].quantile(0.25),
-            df['log_price_per_m2'].quantile(0.5),
-            df['log_price_per_m2'].quantile(0.75),
-            df['log_price_per_m2'].max()
-        ]
+                df = df.rename(columns={level_column: 'code'})
+        center_lat, center_lon = center or cls.calculate_geojson_center(geojson_data)
+        geojson_data = cls.add_price_to_geojson(df, geojson_data, geojson_key)
+        # min, quartiles and max in a single pass (NaN skipped like pandas did)
+        thresholds = np.nanquantile(df['log_price_per_m2'].to_numpy(),
+                                    [0.0, 0.25, 0.5, 0.75, 1.0]).tolist()
         price_map = folium.Map(location=[center_lat, center_lon], zoom_start=zoom_start)
-        folium.Choropleth(
-            geo_data=geojson_data,
-            name='choropleth',
-            data=df,
-            columns=[code, 'log_price_per_m2'],
-            key_on=f'feature.properties.{geojson_key}',
-            fill_color='YlOrRd',  # Color scale from yellow to red
-            fill_opacity=0.7,
-            line_opacity=0.2,
-            legend_name='Log of Price per m² (€)',
-            threshold_scale=thresholds  # Custom thresholds based on the logarithmic scale
-        ).add_to(price_map)
-
+        # Custom thresholds based on the logarithmic scale, colored from yellow to red
+        colormap = StepColormap(
+            color_brewer('YlOrRd', n=len(thresholds) - 1),
+            index=thresholds,
+            vmin=thresholds[0],
+            vmax=thresholds[-1],
+            caption='Log of Price per m² (€)',
+        )
+
+        def style_function(feature):
+            log_price = feature['properties'].get('log_price_per_m2')
+            if log_price is None or np.isnan(log_price):
+                fill_color = 'black'
+            else:
+                fill_color = colormap.rgb_hex_str(log_price)
+            return {
+                'weight': 1,
+                'opacity': 0.2,
+                'color': 'black',
+                'fillOpacity': 0.7,
+                'fillColor': fill_color,
+            }
+
+        # A single layer carries both the colors and the tooltip, so the geometry is embedded once
         folium.GeoJson(
             geojson_data,
-            style_function=lambda feature: {
-                'fillColor': '#ffffff00',
-                'color': 'transparent',
-                'weight': 0,
-                'fillOpacity': 0,
-            },
+            name='choropleth',
+            style_function=style_function,
             tooltip=folium.GeoJsonTooltip(
                 fields=[code, 'average_price_per_m2'],
-                aliases=[self.LEVEL_MAP[self.level] + ' :', 'price per m²:'],
+                aliases=[level_column + ' :', 'price per m²:'],
                 localize=True,
                 sticky=False,
                 labels=True,
                 style=("background-color: white; color: black; font-weight: bold;"),
             )
         ).add_to(price_map)
+        colormap.add_to(price_map)
         map_filename = map_filename or 'price_per_m2_choropleth_map.html'
         price_map.save(map_filename)
         logging.info("Map has been saved as %s", map_filename)
@@ -227,6 +451,8 @@ class ChoroplethMapGenerator:
         """
         Generate and save choropleth maps for specified regions or departments.
         """
+        if self._indexed_geojson is not geojson_data:
+            self._prepare_indices(geojson_data, geojson_key)
         if level == "pays":
             self._create_country_map(df, geojson_data, geojson_key, level)
         elif level == "region":
@@ -234,6 +460,33 @@ class ChoroplethMapGenerator:
         elif level == "departement":
             self._create_department_maps(df, geojson_data, geojson_key)
 
+    def _render_maps(self, tasks):
+        """
+        Render sub-maps in parallel worker processes.
+
+        Args:
+            tasks (list of tuple): render_choropleth_map arguments of each map.
+        """
+        if not tasks:
+            return
+        with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1)) as executor:
+            list(executor.map(_render_one, tasks))
+
+    @staticmethod
+    def _drop_unused_categories(df):
+        """
+        Drop the unused categories of a slice's categorical columns, so that a slice sent to a
+        worker process does not carry the categories of the whole table.
+
+        Args:
+            df (pd.DataFrame): Slice of the grouped data.
+
+        Returns:
+            pd.DataFrame: The slice with only its own categories.
+        """
+        columns = df.select_dtypes('category').columns
+        return df.assign(**{column: df[column].cat.remove_unused_categories() for column in columns})
+
     def _create_country_map(self, df, geojson_data, geojson_key, level):
         """
         Create a country-level map.
@@ -242,66 +495,91 @@ class ChoroplethMapGenerator:
         geojson_filtered = geojson_data
         geojson_key = 'nom'
         map_filename = os.path.join(self.output_dir, 'price_per_m2_region_choropleth_map.html')
-        self.create_choropleth_map(df_region_departments, geojson_filtered, geojson_key, level, map_filename)
+        self.create_choropleth_map(df_region_departments, geojson_filtered, geojson_key, level, map_filename,
+                                   center=self._center_of_codes(self._feat_by_code))
 
     def _create_region_maps(self, df, geojson_data, geojson_key):
         """
         Create maps for each region.
         """
+        # Split the frame by department once instead of scanning it per region
+        df_by_department = dict(tuple(df.groupby('departement', sort=False, observed=True)))
+        output_dir = self.output_dir
+        tasks = []
         for scale in self.scale_list:
             region_departments = self.display_scale_list(scale)
             if not region_departments:
                 continue
 
-            df_region_departments = df[df['departement'].isin(region_departments)]
-            geojson_filtered = self._filter_geojson_by_departments(geojson_data, geojson_key, region_departments)
+            parts = [df_by_department[code] for code in region_departments if code in df_by_department]
+            df_region_departments = self._drop_unused_categories(pd.concat(parts) if parts else df.iloc[:0])
+            geojson_filtered = self._filter_geojson_by_departments(region_departments)
 
             if not df_region_departments.empty and geojson_filtered['features']:
-                map_filename = os.path.join(self.output_dir,
+                map_filename = os.path.join(output_dir,
                                             f'price_per_m2_{scale.replace(" ", "_")}_choropleth_map.html')
-                self.create_choropleth_map(df_region_departments, geojson_filtered, geojson_key, "region", map_filename)
+                tasks.append((self.level, df_region_departments, geojson_filtered, geojson_key, "region",
+                              map_filename, self._center_of_codes(region_departments)))
+        self._render_maps(tasks)
 
     def _create_department_maps(self, df, geojson_data, geojson_key):
         """
         Create maps for each department.
         """
+        # Split the communes by department once instead of scanning the frame per department;
+        # the department is resolved per category and routed to the rows through the integer codes
+        communes = df['commune'].astype('category')
+        department_of_category = extract_department_codes(communes.cat.categories)
+        department_of_row = department_of_category[communes.cat.codes.to_numpy()]
+        df_by_department = {
+            department_code: self._drop_unused_categories(group)
+            for department_code, group in df.groupby(department_of_row, sort=False)
+        }
+        communes_by_department = defaultdict(list)
+        features_by_department = defaultdict(list)
+        feat_by_code = self._feat_by_code
+        commune_codes = list(feat_by_code)
+        for commune_code, department_code in zip(commune_codes, extract_department_codes(commune_codes)):
+            communes_by_department[department_code].append(commune_code)
+            features_by_department[department_code].append(feat_by_code[commune_code])
+        output_dir = self.output_dir
+        tasks = []
         for scale in self.scale_list:
             region_departments = self.display_scale_list(scale)
             if not region_departments:
                 continue
 
             for department_code in region_departments:
-                #We need to filter the geojson if the commune start with the 'code' and strictly equal
-                df_region_departments = df[df['commune'].str.startswith(department_code)]
+                # Rows and features are pre-bucketed by department with extract_department_codes
+                df_region_departments = df_by_department.get(department_code, df.iloc[:0])
+                # Wrap the department's prebuilt feature list rather than copying it
                 geojson_filtered = {
                     'type': 'FeatureCollection',
-                    'features': [
-                        feature for feature in geojson_data['features']
-                        if feature['properties'][geojson_key].startswith(department_code)
-                    ]
+                    'features': features_by_department.get(department_code, [])
                 }
                 if not df_region_departments.empty and geojson_filtered['features']:
                     map_filename = os.path.join(
-                        self.output_dir,
+                        output_dir,
                         f'price_per_m2_per_department_'
                         f'{department_code.replace(" ", "_")}'
                         f'_choropleth_map.html')
-                    self.create_choropleth_map(df_region_departments,
-                                               geojson_filtered,
-                                               geojson_key,
-                                               "departement",
-                                               map_filename)
-
-    def _filter_geojson_by_departments(self, geojson_data, geojson_key, department_codes):
+                    tasks.append((self.level,
+                                  df_region_departments,
+                                  geojson_filtered,
+                                  geojson_key,
+                                  "departement",
+                                  map_filename,
+                                  self._center_of_codes(communes_by_department[department_code])))
+        self._render_maps(tasks)
+
+    def _filter_geojson_by_departments(self, department_codes):
         """
         Filter GeoJSON data to include only specified department codes.
         """
+        feat_by_code = self._feat_by_code
         return {
             'type': 'FeatureCollection',
-            'features': [
-                feature for feature in geojson_data['features']
-                if feature['properties'][geojson_key] in department_codes
-            ]
+            'features': [feat_by_code[code] for code in department_codes if code in feat_by_code]
         }
 
     def generate_maps(self):
@@ -310,8 +588,7 @@ class ChoroplethMapGenerator:
         """
         df_grouped = self.load_grouped_data(self.pickle_file)
         level = self.level
-        with open(self.geojson_file, 'r', encoding='utf-8') as f:
-            geojson_data = json.load(f)
+        geojson_data = self._load_geojson(geojson_key='code')
         self.create_choropleth_map_per_region_department(df_grouped,
                                                          geojson_data,
                                                          geojson_key='code',
@@ -4,21 +4,40 @@ data from specified URLs, including GeoJSON files for geographic boundaries.
 """
 
 import os
-import gzip
-import shutil
 import logging
-import json
-from urllib.request import urlopen
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 import requests
-import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
 from tqdm import tqdm
+from src.utils.json_io import load_json, parse_json
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Identifier and code columns of the DVF file, read as strings so that codes such as
+# '01' or '2A' keep their exact form and need no type inference
+DVF_STRING_COLUMNS = [
+    'id_mutation', 'id_parcelle', 'ancien_id_parcelle',
+    'code_commune', 'ancien_code_commune', 'code_departement', 'code_postal',
+    'adresse_suffixe', 'adresse_code_voie', 'numero_volume',
+    'lot1_numero', 'lot2_numero', 'lot3_numero', 'lot4_numero', 'lot5_numero',
+    'code_nature_culture', 'code_nature_culture_speciale',
+]
+# Numeric columns of the DVF file that can be missing or hold decimals further down the
+# file than the first block, read as floats
+DVF_FLOAT_COLUMNS = [
+    'valeur_fonciere', 'adresse_numero',
+    'lot1_surface_carrez', 'lot2_surface_carrez', 'lot3_surface_carrez',
+    'lot4_surface_carrez', 'lot5_surface_carrez', 'code_type_local',
+    'surface_reelle_bati', 'nombre_pieces_principales', 'surface_terrain',
+    'longitude', 'latitude',
+]
+
 
 class DataDownloader:
     """
-    A class for downloading, unzipping, processing, and saving real estate data.
+    A class for downloading, processing, and saving real estate data.
 
     Attributes:
         url (str): URL of the dataset to download.
@@ -36,9 +55,8 @@ class DataDownloader:
         """
         self.url = url
         self.filename = filename
-        self.unzipped_filename = filename.replace('.gz', '')
         self.download_folder = download_folder
-        self.pickle_filename = os.path.join(download_folder, 'full.pkl')
+        self.parquet_filename = os.path.join(download_folder, 'full.parquet')
 
         # Ensure the download folder exists
         if not os.path.exists(download_folder):
@@ -46,93 +64,145 @@ class DataDownloader:
 
     def download_file(self):
         """
-        Download the file from the URL with a progress bar (tqdm).
-        """
-        response = requests.get(self.url, stream=True)
-        total_size = int(response.headers.get('content-length', 0))
-
-        with open(self.filename, 'wb') as file, tqdm(
-                desc=self.filename,
-                total=total_size,
-                unit='B',
-                unit_scale=True,
-                unit_divisor=1024,
-        ) as bar:
-            for data in response.iter_content(chunk_size=1024):
-                file.write(data)
-                bar.update(len(data))
-
-    def unzip_file(self):
-        """
-        Unzip the downloaded .gz file.
-        """
-        with gzip.open(self.filename, 'rb') as f_in:
-            with open(self.unzipped_filename, 'wb') as f_out:
-                shutil.copyfileobj(f_in, f_out)
+        Download the file from the URL with a progress bar (tqdm), copying the
+        response to disk in 1 MiB blocks.
+        """
+        with requests.get(self.url, stream=True) as response:
+            response.raise_for_status()
+            total_size = int(response.headers.get('content-length', 0))
+            # Apply any transfer Content-Encoding, as iter_content did
+            response.raw.decode_content = True
+
+            with open(self.filename, 'wb') as file, tqdm.wrapattr(
+                    file,
+                    'write',
+                    desc=self.filename,
+                    total=total_size,
+                    unit='B',
+                    unit_scale=True,
+                    unit_divisor=1024,
+            ) as file_with_bar:
+                shutil.copyfileobj(response.raw, file_with_bar, length=1 << 20)
 
     def load_csv_to_dataframe(self):
         """
-        Load the unzipped CSV file into a pandas DataFrame.
+        Load the downloaded .gz CSV file into a pandas DataFrame, decompressing it on the fly
+        and parsing it with the multithreaded pyarrow CSV reader.
 
         Returns:
             pd.DataFrame: Loaded DataFrame.
         """
-        return pd.read_csv(self.unzipped_filename, low_memory=False)
+        # Declared types keep the codes as strings (no per-block type inference on values
+        # such as '01' or '2A') and let integer columns hold missing values
+        column_types = {column: pa.string() for column in DVF_STRING_COLUMNS}
+        column_types.update({column: pa.float64() for column in DVF_FLOAT_COLUMNS})
+        # Dates stay strings, as the downstream code parses them itself
+        column_types['date_mutation'] = pa.string()
+        convert_options = pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True)
+        with pa.CompressedInputStream(pa.OSFile(self.filename), 'gzip') as stream:
+            table = pa_csv.read_csv(stream, convert_options=convert_options)
+        return table.to_pandas()
 
-    def save_dataframe_as_pickle(self, df):
+    def save_dataframe(self, df):
         """
-        Save a pandas DataFrame as a pickle file.
+        Save a pandas DataFrame as a zstd-compressed Parquet file.
 
         Args:
             df (pd.DataFrame): DataFrame to save.
         """
-        df.to_pickle(self.pickle_filename)
-        logging.info("DataFrame saved as %s", self.pickle_filename)
+        df.to_parquet(self.parquet_filename, engine='pyarrow', compression='zstd', index=False)
+        logging.info("DataFrame saved as %s", self.parquet_filename)
 
     def clean_up(self):
         """
-        Remove the downloaded and unzipped files.
+        Remove the downloaded file.
         """
         if os.path.exists(self.filename):
             os.remove(self.filename)
-        if os.path.exists(self.unzipped_filename):
-            os.remove(self.unzipped_filename)
         logging.info("Temporary files deleted.")
 
+    @staticmethod
+    def load_local_geojson(data_path):
+        """
+        Load GeoJSON data from a local file.
+
+        Args:
+            data_path (str): Path to the GeoJSON file.
+
+        Returns:
+            dict: Loaded GeoJSON data, or None if the file cannot be read.
+        """
+        try:
+            geojson = load_json(data_path)
+            logging.info("Successfully loaded GeoJSON data from %s", data_path)
+            return geojson
+        except Exception as e:
+            logging.error("Failed to load GeoJSON data from %s: %s", data_path, e)
+            return None
+
     def load_geojson(self, name, url):
         """
         Load GeoJSON data from a file or download it if not available locally.
+        A local file saved with an ETag is revalidated with a conditional request
+        and only downloaded again when it changed on the server.
 
         Args:
             name (str): Name of the GeoJSON file (used for local saving).
-            geojson_url (str): URL to download the GeoJSON file.
+            url (str): URL to download the GeoJSON file.
 
         Returns:
             dict: Loaded GeoJSON data.
         """
         data_path = os.path.join(self.download_folder, f'{name}.geojson')
+        etag_path = os.path.join(self.download_folder, f'{name}.etag')
+        headers = {}
         if os.path.exists(data_path):
-            try:
-                with open(data_path, 'r', encoding='utf-8') as f:
-                    geojson = json.load(f)
-                logging.info("Successfully loaded GeoJSON data from %s", data_path)
-                return geojson
-            except Exception as e:
-                logging.error("Failed to load GeoJSON data from %s: %s", data_path, e)
-                return None
-        else:
-            try:
-                with urlopen(url) as response:
-                    geojson = json.load(response)
-                # Save to local file
-                os.makedirs(self.download_folder, exist_ok=True)
-                with open(data_path, 'w', encoding='utf-8') as f:
-                    json.dump(geojson, f)
-                logging.info("Successfully downloaded and saved GeoJSON data to %s", data_path)
-                return geojson
-            except Exception as e:
-                logging.error("Failed to download GeoJSON data from %s: %s", url, e)
-                return None
+            if not os.path.exists(etag_path):
+                return self.load_local_geojson(data_path)
+            with open(etag_path, 'r', encoding='utf-8') as f:
+                headers['If-None-Match'] = f.read().strip()
+
+        try:
+            # A timeout lets a hanging network fall back to the local copy instead of blocking
+            response = requests.get(url, headers=headers, timeout=(5, 60))
+            if response.status_code == 304:
+                logging.info("GeoJSON data in %s is up to date.", data_path)
+                return self.load_local_geojson(data_path)
+            response.raise_for_status()
+            content = response.content
+            geojson = parse_json(content)
+            # Save the downloaded bytes as-is, no need to serialize the parsed data again
+            os.makedirs(self.download_folder, exist_ok=True)
+            with open(data_path, 'wb') as f:
+                f.write(content)
+            etag = response.headers.get('ETag')
+            if etag:
+                with open(etag_path, 'w', encoding='utf-8') as f:
+                    f.write(etag)
+            elif os.path.exists(etag_path):
+                os.remove(etag_path)
+            logging.info("Successfully downloaded and saved GeoJSON data to %s", data_path)
+            return geojson
+        except Exception as e:
+            logging.error("Failed to download GeoJSON data from %s: %s", url, e)
+            if headers:
+                # The revalidation failed, the local copy is still usable
+                return self.load_local_geojson(data_path)
+            return None
+
+    def load_geojsons(self, urls):
+        """
+        Load several GeoJSON files concurrently, as the downloads are independent.
+
+        Args:
+            urls (dict): Mapping of GeoJSON file names to their download URLs.
+
+        Returns:
+            dict: Mapping of GeoJSON file names to their loaded data.
+        """
+        with ThreadPoolExecutor(max_workers=len(urls) or 1) as executor:
+            results = executor.map(self.load_geojson, urls.keys(), urls.values())
+            return dict(zip(urls.keys(), results))
 
     def run(self):
         """
@@ -140,14 +210,12 @@ class DataDownloader:
         """
         logging.info("Starting the download process...")
         self.download_file()
-        logging.info("Download complete. Unzipping the file...")
-        self.unzip_file()
-        logging.info("Unzipping complete. Loading the CSV into a DataFrame...")
+        logging.info("Download complete. Loading the CSV into a DataFrame...")
         df = self.load_csv_to_dataframe()
         logging.info("Cleaning duplicates")
         df = df.drop_duplicates(subset='id_parcelle', keep='first')
-        logging.info("Data loaded into DataFrame. Saving as pickle...")
-        self.save_dataframe_as_pickle(df)
+        logging.info("Data loaded into DataFrame. Saving as Parquet...")
+        self.save_dataframe(df)
         logging.info("Cleaning up temporary files...")
         self.clean_up()
         logging.info("Process completed successfully!")
@@ -160,6 +228,8 @@ if __name__ == '__main__':
 
     downloader = DataDownloader(URL)
     downloader.run()
-    regions_geojson = downloader.load_geojson('regions', REGIONS_GEOJSON_URL)
-    departments_geojson = downloader.load_geojson('departments', DEPARTMENTS_GEOJSON_URL)
-    communes_geojson = downloader.load_geojson('communes', COMMUNES_GEOJSON_URL)
+    geojsons = downloader.load_geojsons({
+        'regions': REGIONS_GEOJSON_URL,
+        'departments': DEPARTMENTS_GEOJSON_URL,
+        'communes': COMMUNES_GEOJSON_URL,
+    })
@@ -0,0 +1,56 @@
+"""
+This module provides helpers to read and write JSON files, using orjson when it
+is installed and falling back to the standard library otherwise.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def parse_json(content):
+    """
+    Parse a JSON document.
+
+    Args:
+        content (bytes): Raw JSON content.
+
+    Returns:
+        The parsed JSON data.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def load_json(path):
+    """
+    Load and parse a JSON file.
+
+    Args:
+        path (str): Path to the JSON file.
+
+    Returns:
+        The parsed JSON data.
+    """
+    with open(path, 'rb') as f:
+        return parse_json(f.read())
+
+
+def dump_json(data, path):
+    """
+    Write data to a compact UTF-8 JSON file.
+
+    Args:
+        data: JSON-serializable data.
+        path (str): Path to the JSON file.
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
@@ -6,55 +6,90 @@ including data loading, transformations, and geographic mapping.
 
 import os
 import logging
-import json
+from operator import itemgetter
 
+import numpy as np
 import pandas as pd
 
 from config import DEPT_CODE_TO_REGION
+from src.utils.json_io import load_json, dump_json
 
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Region name of each department code, as a Series for vectorized lookups
+_DEPT_REGIONS = pd.Series(DEPT_CODE_TO_REGION, dtype=object)
+
 class DataPreprocessor:
     """
     Handles data preprocessing tasks such as calculating price per square meter and grouping data.
     """
 
+    # Finest grouping of the data: every grouping level is rolled up from its sums
+    SUM_LEVELS = ['region', 'code_departement', 'code_commune', 'type_local']
+    SUM_COLUMNS = ['valeur_fonciere', 'surface_reelle_bati']
+
     def __init__(self, dataframe):
         self.df = dataframe
+        self._sums = None
 
     def calculate_price_per_m2(self):
         """
         Calculate the price per square meter for each transaction.
-        Removes rows with invalid or missing values in relevant fields.
+        Removes rows with invalid or missing values in relevant fields, and keeps
+        only the columns used for grouping (the original DataFrame keeps them all).
         """
         logging.info("Calculating 'price_per_m2'...")
-        self.df['price_per_m2'] = self.df['valeur_fonciere'] / self.df['surface_reelle_bati']
+        valeur = self.df['valeur_fonciere'].to_numpy(dtype='float64')
+        surface = self.df['surface_reelle_bati'].to_numpy(dtype='float64')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_per_m2 = valeur / surface
+        self.df['price_per_m2'] = price_per_m2
 
         initial_count = len(self.df)
-        self.df = self.df[
-            (self.df['price_per_m2'].notnull()) &
-            (self.df['price_per_m2'] > 0) &
-            (self.df['surface_reelle_bati'].notnull()) &
-            (self.df['surface_reelle_bati'] > 0)
+        # Comparisons with NaN are False, so missing values are dropped as well
+        columns = [
+            column for column in self.SUM_LEVELS + self.SUM_COLUMNS + ['price_per_m2']
+            if column in self.df.columns
         ]
+        # Filter and project in a single copy
+        self.df = self.df.loc[(price_per_m2 > 0) & (surface > 0), columns]
+        self._sums = None
         removed = initial_count - len(self.df)
         logging.info(
             "Removed %d invalid records based on 'price_per_m2' and 'surface_reelle_bati'.",
             removed
         )
 
+    def sums_by_group(self):
+        """
+        Sum the property values and surfaces over the finest grouping of the data,
+        in a single pass. The result is cached until the data is filtered again.
+
+        Returns:
+            pd.DataFrame: The grouping columns with the summed values and surfaces.
+        """
+        if self._sums is None:
+            keys = [level for level in self.SUM_LEVELS if level in self.df.columns]
+            # dropna=False so that each level's rollup decides which missing keys to drop
+            # Project to the used columns first, the rest of the table is not needed
+            self._sums = self.df[keys + self.SUM_COLUMNS].groupby(
+                keys, observed=True, sort=False, dropna=False
+            ).sum().reset_index()
+        return self._sums
+
     def group_by_level(self, levels, column_names):
         """
-        Group data by the specified levels and calculate the average price per square meter.
+        Group data by the specified levels and calculate the average price per square meter,
+        weighted by surface (total value divided by total surface).
 
         Parameters:
             levels (list of str): The column names to group by.
             column_names (list of str): The names to assign to the grouping columns.
 
         Returns:
-            pd.DataFrame: A DataFrame with the grouping columns and
-            the average price per square meter.
+            pd.DataFrame: A DataFrame with the grouping columns, the average
+            price per square meter and its log1p.
         """
         if not isinstance(levels, list):
             levels = [levels]
@@ -71,8 +106,20 @@ class DataPreprocessor:
                 raise KeyError(f"Grouping level '{level}' does not exist in the DataFrame.")
 
         logging.info("Grouping data by %s...", levels)
-        df_grouped = self.df.groupby(levels)['price_per_m2'].mean().reset_index()
+        sums = self.sums_by_group()
+        if all(level in sums.columns for level in levels):
+            source = sums[levels + self.SUM_COLUMNS]
+        else:
+            source = self.df[levels + self.SUM_COLUMNS]
+        totals = source.groupby(levels, observed=True).sum()
+        df_grouped = (totals['valeur_fonciere'] / totals['surface_reelle_bati']).reset_index()
         df_grouped.columns = column_names + ['average_price_per_m2']
+        # Compact dtypes: repeated codes/names as categories, prices in single precision
+        df_grouped[column_names] = df_grouped[column_names].astype('category')
+        df_grouped['average_price_per_m2'] = df_grouped['average_price_per_m2'].astype('float32')
+        # Log scale used by the map color thresholds, computed once here instead of per map
+        # (in double precision from the stored prices, so it matches np.log1p on a feature's price)
+        df_grouped['log_price_per_m2'] = np.log1p(df_grouped['average_price_per_m2'].astype('float64'))
         logging.info("Grouped data by %s successfully.", levels)
         return df_grouped
 
@@ -89,39 +136,46 @@ class DataHandler:
 
     def load_data(self, filename):
         """
-        Load data from a pickle file.
+        Load data from a Parquet, Feather or pickle file, depending on its extension.
 
         Parameters:
-            filename (str): The name of the pickle file to load.
+            filename (str): The name of the file to load.
 
         Returns:
             pd.DataFrame: The loaded DataFrame.
         """
         filepath = os.path.join(self.input_dir, filename)
-        df = pd.DataFrame
         if not os.path.exists(filepath):
-            logging.error("Data file %s  does not exist.", filepath)
-            raise FileNotFoundError("Data file %s does not exist.", filepath)
+            logging.error("Data file %s does not exist.", filepath)
+            raise FileNotFoundError(f"Data file {filepath} does not exist.")
         logging.info("Loading data from %s ...", filepath)
-        try:
+        if filepath.endswith('.parquet'):
+            df = pd.read_parquet(filepath)
+        elif filepath.endswith('.feather'):
+            df = pd.read_feather(filepath, use_threads=True)
+        else:
             df = pd.read_pickle(filepath)
-            logging.info("Loaded data with %s records.", len(df))
-        except Exception as e:
-            logging.error("Error in data loading: %s", {e})
+        logging.info("Loaded data with %s records.", len(df))
         return df
 
     def save_data(self, df, filename):
         """
-        Save a DataFrame to a pickle file.
+        Save a DataFrame to a file whose format depends on its extension:
+        snappy-compressed Parquet, lz4-compressed Feather or pickle.
 
         Parameters:
             df (pd.DataFrame): The DataFrame to save.
-            filename (str): The name of the pickle file to save to.
+            filename (str): The name of the file to save to.
         """
         filepath = os.path.join(self.output_dir, filename)
         logging.info("Saving data to %s ...",filepath)
         try:
-            df.to_pickle(filepath)
+            if filepath.endswith('.parquet'):
+                df.to_parquet(filepath, engine='pyarrow', compression='snappy')
+            elif filepath.endswith('.feather'):
+                df.to_feather(filepath, compression='lz4')
+            else:
+                df.to_pickle(filepath)
             logging.info("Data saved to %s successfully.", filepath)
         except Exception as e:
             logging.error("Data is not saved: Error - %s", {e})
@@ -141,8 +195,15 @@ def map_departments_to_regions(df, dept_col='code_departement'):
         logging.error("Department column %s not found in DataFrame.", dept_col)
         raise KeyError("Department column %s not found in DataFrame.", dept_col)
 
-    # Perform the mapping
-    df['region'] = df[dept_col].map(DEPT_CODE_TO_REGION)
+    # Map each distinct department once, then gather the regions through the category codes
+    departments = df[dept_col].astype('category')
+    region_of_category = departments.cat.categories.map(_DEPT_REGIONS)
+    region_names = region_of_category.dropna().unique().sort_values()
+    # Trailing -1 so that missing departments (code -1) get a missing region
+    region_codes = np.append(region_names.get_indexer(region_of_category), -1)
+    df['region'] = pd.Categorical.from_codes(
+        region_codes[departments.cat.codes.to_numpy()], categories=region_names
+    )
 
     # Log any unmapped departments
     missing_regions = df['region'].isnull().sum()
@@ -170,6 +231,21 @@ def extract_department_code(commune_code):
 
     return commune_code[:2]
 
+def extract_department_codes(commune_codes):
+    """
+    Vectorized version of extract_department_code for a sequence of commune codes.
+
+    Parameters:
+        commune_codes (array-like): The communes' INSEE codes.
+
+    Returns:
+        np.ndarray: The department code of each commune.
+    """
+    codes = np.asarray(commune_codes, dtype=str)
+    # Casting to a narrower fixed-width string dtype keeps the first characters
+    first_two = codes.astype('U2')
+    return np.where(first_two == '97', codes.astype('U3'), first_two)
+
 def build_regions_dict(regions_geojson):
     """
     Builds a dictionary mapping region codes to region names from a GeoJSON object.
@@ -199,21 +275,19 @@ def build_departments_dict(departments_geojson):
               - 'region_code': The region code (None in this case).
               - 'region_name': The name of the associated region.
     """
-    departments_dict = {}
-    for feature in departments_geojson['features']:
-        dept_code = feature['properties']['code']
-        dept_name = feature['properties']['nom']
-        region_name = DEPT_CODE_TO_REGION.get(dept_code)
-
-        if not region_name:
-            region_name = "Inconnue"
-
-        departments_dict[dept_code] = {
-            'name': dept_name,
+    properties = [feature['properties'] for feature in departments_geojson['features']]
+    # Region names of all departments in one lookup, "Inconnue" for unknown codes
+    region_names = _DEPT_REGIONS.reindex(
+        [prop['code'] for prop in properties], fill_value="Inconnue"
+    ).tolist()
+    return {
+        prop['code']: {
+            'name': prop['nom'],
             'region_code': None,
             'region_name': region_name
         }
-    return departments_dict
+        for prop, region_name in zip(properties, region_names)
+    }
 
 
 def build_communes_dict(communes_geojson):
@@ -229,16 +303,16 @@ def build_communes_dict(communes_geojson):
               - 'name': The name of the commune.
               - 'department_code': The code of the associated department.
     """
-    communes_dict = {}
-    for feature in communes_geojson['features']:
-        commune_code = feature['properties']['code']
-        commune_name = feature['properties']['nom']
-        dept_code = extract_department_code(commune_code)
-        communes_dict[commune_code] = {
-            'name': commune_name,
+    properties = [feature['properties'] for feature in communes_geojson['features']]
+    # Department codes of all communes in one vectorized pass
+    dept_codes = extract_department_codes([prop['code'] for prop in properties]).tolist()
+    return {
+        prop['code']: {
+            'name': prop['nom'],
             'department_code': dept_code
         }
-    return communes_dict
+        for prop, dept_code in zip(properties, dept_codes)
+    }
 
 
 def build_region_dept_commune_map(communes_dict, departments_dict, regions_dict):
@@ -257,37 +331,36 @@ def build_region_dept_commune_map(communes_dict, departments_dict, regions_dict)
     inverted_regions = {name: code for code, name in regions_dict.items()}
 
     region_dept_commune_map = {}
+    # Communes list of each department code, resolved in the nested map once per department
+    communes_by_dept = {}
 
     for ccode, cinfo in communes_dict.items():
         dept_code = cinfo['department_code']
-        commune_name = cinfo['name']
-        dept_info = departments_dict.get(dept_code)
+        communes = communes_by_dept.get(dept_code)
 
-        if dept_info:
+        if communes is None:
+            dept_info = departments_dict.get(dept_code)
+            if not dept_info:
+                continue
             region_name = dept_info['region_name']
-            dept_name = dept_info['name']
-            region_code = inverted_regions.get(region_name, None)
-
-            if region_name not in region_dept_commune_map:
-                region_dept_commune_map[region_name] = {
-                    'code': region_code,
-                    'departments': {}
-                }
-
-            if dept_name not in region_dept_commune_map[region_name]['departments']:
-                region_dept_commune_map[region_name]['departments'][dept_name] = {
-                    'code': dept_code,
-                    'communes': []
-                }
-
-            region_dept_commune_map[region_name]['departments'][dept_name]['communes'].append({
-                'code': ccode,
-                'name': commune_name
+            region_data = region_dept_commune_map.setdefault(region_name, {
+                'code': inverted_regions.get(region_name, None),
+                'departments': {}
+            })
+            dept_data = region_data['departments'].setdefault(dept_info['name'], {
+                'code': dept_code,
+                'communes': []
             })
+            communes = communes_by_dept[dept_code] = dept_data['communes']
+
+        communes.append({
+            'code': ccode,
+            'name': cinfo['name']
+        })
 
-    for region_name, rdata in region_dept_commune_map.items():
-        for dept_name, ddata in rdata['departments'].items():
-            ddata['communes'].sort(key=lambda x: x['name'])
+    by_name = itemgetter('name')
+    for communes in communes_by_dept.values():
+        communes.sort(key=by_name)
 
     return region_dept_commune_map
 
@@ -302,12 +375,9 @@ def create_region_dept_commune_map(input_dir='data/cleaned', output_dir='data/cl
     Returns:
         None
     """
-    with open(input_dir+'/regions.geojson', 'r', encoding='utf-8') as file:
-        regions_geojson = json.load(file)
-    with open(input_dir+'/departments.geojson', 'r', encoding='utf-8') as file:
-        departments_geojson = json.load(file)
-    with open(input_dir+'/communes.geojson', 'r', encoding='utf-8') as file:
-        communes_geojson = json.load(file)
+    regions_geojson = load_json(input_dir+'/regions.geojson')
+    departments_geojson = load_json(input_dir+'/departments.geojson')
+    communes_geojson = load_json(input_dir+'/communes.geojson')
 
     regions_dict = build_regions_dict(regions_geojson)
     departments_dict = build_departments_dict(departments_geojson)
@@ -319,8 +389,7 @@ def create_region_dept_commune_map(input_dir='data/cleaned', output_dir='data/cl
     )
 
     output_path = output_dir+'/region_dept_commune_map.json'
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(region_dept_commune_map, f, ensure_ascii=False, indent=2)
+    dump_json(region_dept_commune_map, output_path)
     logging.info("Saved region-department-commune map to %s", output_path)
 
 
@@ -328,7 +397,7 @@ def main():
     """
      Main entry point for the preprocessing pipeline.
 
-     - Loads data from a pickle file.
+     - Loads data from a Parquet file.
      - Maps departments to their regions.
      - Preprocesses data (e.g., calculates price per square meter).
      - Groups data at various administrative levels (communes, departments, regions).
@@ -343,7 +412,10 @@ def main():
 
     data_handler = DataHandler(input_dir=input_dir, output_dir=output_dir)
 
-    data = data_handler.load_data('full.pkl')
+    data = data_handler.load_data('full.parquet')
+    # Repeated codes as categories: the grouping below hashes small integer codes instead of strings
+    for column in ('code_commune', 'code_departement', 'type_local'):
+        data[column] = data[column].astype('category')
 
     data = map_departments_to_regions(data, dept_col='code_departement')
 
@@ -364,10 +436,10 @@ def main():
         column_names=['region', 'type_local']
     )
 
-    data_handler.save_data(df_by_commune, 'prix_m2_par_commune.pkl')
-    data_handler.save_data(df_by_departement, 'prix_m2_par_departement.pkl')
-    data_handler.save_data(df_by_region, 'prix_m2_par_region.pkl')
-    data_handler.save_data(data, 'full_with_region.pkl')
+    data_handler.save_data(df_by_commune, 'prix_m2_par_commune.feather')
+    data_handler.save_data(df_by_departement, 'prix_m2_par_departement.feather')
+    data_handler.save_data(df_by_region, 'prix_m2_par_region.feather')
+    data_handler.save_data(data, 'full_with_region.parquet')
 
     create_region_dept_commune_map(input_dir=input_dir, output_dir=output_dir)
 